@@ -19,30 +19,72 @@ a = [
     1,
     2,
     ]
+
+Besides running as a flake8 plugin, files can be checked in one batch with
+`furlinter PATH...` (or `python -m furlinter PATH...`).
 """
 
 from __future__ import annotations
 
-import io
+import argparse
+import concurrent.futures
+import functools
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+import time
 import tokenize
-from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Set, Tuple
-from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 
 CODE_FUR901 = "FUR901"
+_FUR901_MSG = CODE_FUR901 + " closer-only line must align with continuation indent (expected col %d, found col %d)"
+
+# One alternation covering everything _scan_brackets() cares about; the regex
+# engine skips identifiers, operators and whitespace between matches in C.
+# That already is the scan-ahead a translate() pre-pass would provide, so there isn't one.
+_SCAN_RE = re.compile(r"""
+    (?=[\n()\[\]{}'"\#])   # cheap first-character filter before trying the alternatives
+    (?:
+      (?P<first>\n[ \t\f\r\\]*)(?=[^ \t\f\r\\\n#])   # line break, then the line's first token
+    | (?P<nl>\n)                                      # line break before a blank/comment-only line
+    | (?P<open>[(\[{])
+    | (?P<close>[)\]}])
+    | (?P<str>
+          '''(?:[^'\\]|\\.?|'(?!''))*(?:'''|\Z)
+        | \"\"\"(?:[^"\\]|\\.?|"(?!""))*(?:\"\"\"|\Z)
+        | '(?:[^'\\\n]|\\(?:\r\n|.)?)*'?              # unterminated: ends at the newline
+        | "(?:[^"\\\n]|\\(?:\r\n|.)?)*"?
+      )
+    | \#[^\n]*
+    )
+""", re.VERBOSE | re.DOTALL)
+_LEADING_WS_RE = re.compile(r"[ \t\f\r\\]*")
 
-@dataclass
 class Context:
-    kind: str  # "[]", "()", "{}"
-    opener_line: int
-    opener_col: int
-    opener_line_text: str
-    inner_line_first_cols: Dict[int, int] = field(default_factory=dict)  # line -> first token col (per physical line)
-    closer_line: Optional[int] = None
-    closer_col: Optional[int] = None
-    element_and_closer_same_line: bool = False  # True if closer shares its line with element tokens
+    """A bracket pair found by the scanner.
+
+    A plain class with __slots__: files have many of these, and slots keep each
+    one small and make attribute access a direct slot load.
+    """
+    __slots__ = (
+        "kind", "opener_line", "opener_col", "col_counts",
+        "closer_line", "closer_col", "closer_pos", "element_and_closer_same_line",
+        )
+
+    def __init__(self, kind: str, opener_line: int, opener_col: int) -> None:
+        self.kind = kind  # opening bracket
+        self.opener_line = opener_line
+        self.opener_col = opener_col
+        self.col_counts: Dict[int, int] = {}  # first-token col -> number of inner lines starting there
+        self.closer_line: Optional[int] = None
+        self.closer_col: Optional[int] = None
+        self.closer_pos: Optional[int] = None  # index of the closer in the source
+        self.element_and_closer_same_line = False  # True if closer shares its line with element tokens
 
 def _first_non_ws_col(line: str) -> int:
     i = 0
@@ -50,44 +92,71 @@ def _first_non_ws_col(line: str) -> int:
         i += 1
     return i
 
-def _iter_contexts(srccode_bytes: bytes) -> Iterable[Context]:
-    """Yield bracket contexts discovered via tokenize (stack-based)."""
-    tokgen = tokenize.tokenize(io.BytesIO(srccode_bytes).readline)
+def _first_token_col(srccode: str, pos: int, line_start: int) -> int:
+    """Column of the first token at or after `pos` on the same line, or -1 if none."""
+    pos = _LEADING_WS_RE.match(srccode, pos).end()
+    if pos < len(srccode) and srccode[pos] not in "\n#":
+        return pos - line_start
+    return -1
 
+def _scan_brackets(srccode: str) -> Iterable[Context]:
+    """Yield bracket contexts found by a single pass over the source (stack-based).
+
+    This is a purpose-built replacement for running the full tokenizer: it only
+    tracks what FUR901 needs -- bracket openers/closers outside of strings and
+    comments, and the column of the first token on each physical line.
+    """
     stack: List[Context] = []
-    seen_first_token_on_line: Set[Tuple[int, int]] = set()  # (line, depth) to avoid duplicates
-
-    def record_first_token_for_open_contexts(line: int, col: int):
-        # For each open context, if this token appears on a line after the opener,
-        # record the first token column for that line (once per context).
-        for depth, ctx in enumerate(stack):
-            if line > ctx.opener_line and ctx.closer_line is None:
-                key = (line, depth)
-                if key not in seen_first_token_on_line:
-                    ctx.inner_line_first_cols.setdefault(line, col)
-                    seen_first_token_on_line.add(key)
-
-    for tok in tokgen:
-        ttype, tstr, (srow, scol), (erow, ecol), line_text = tok
-
-        if ttype == tokenize.OP and tstr in "([{":
-            kind = {"(": "()", "[": "[]", "{": "{}"}[tstr]
-            stack.append(Context(kind=kind, opener_line=srow, opener_col=scol, opener_line_text=line_text or ""))
-
-        # Register first token columns for open contexts (skip trivia)
-        if ttype not in (tokenize.NL, tokenize.NEWLINE, tokenize.ENCODING, tokenize.ENDMARKER, tokenize.COMMENT):
-            record_first_token_for_open_contexts(srow, scol)
-
-        if ttype == tokenize.OP and tstr in ")]}":
+    line = 1
+    line_start = 0
+    # column of the first token on the current line, -1 if there is none (yet)
+    line_first_col = _first_token_col(srccode, 0, 0)
+
+    for m in _SCAN_RE.finditer(srccode):
+        what = m.lastgroup
+
+        if what == "first":
+            line += 1
+            line_start = m.start() + 1
+            # First token on this physical line: record it for every open context.
+            # Contexts opened on this line can't be on the stack yet, so all of
+            # them started on an earlier line.
+            line_first_col = col = m.end() - line_start
+            for ctx in stack:
+                counts = ctx.col_counts
+                counts[col] = counts.get(col, 0) + 1
+        elif what == "nl":
+            line += 1
+            line_start = m.start() + 1
+            line_first_col = -1
+        elif what == "open":
+            ch = m.group()
+            stack.append(Context(ch, line, m.start() - line_start))
+        elif what == "close":
             if stack:
-                ctx = stack[-1]
-                ctx.closer_line = srow
-                ctx.closer_col = scol
-                # If we recorded a first token on this same line and it starts before closer,
+                col = m.start() - line_start
+                ctx = stack.pop()
+                ctx.closer_line = line
+                ctx.closer_col = col
+                ctx.closer_pos = m.start()
+                # If a token on this same line starts before the closer,
                 # then it's an element+closer line.
-                if srow in ctx.inner_line_first_cols and ctx.inner_line_first_cols[srow] < scol:
+                if line != ctx.opener_line and line_first_col < col:
                     ctx.element_and_closer_same_line = True
-                yield stack.pop()
+                yield ctx
+        elif what == "str":
+            start, end = m.span()
+            newlines = srccode.count("\n", start, end)
+            if newlines:
+                # The literal spans lines; the line it ends on gets its first
+                # token from whatever follows the literal.
+                line += newlines
+                line_start = srccode.rfind("\n", start, end) + 1
+                line_first_col = col = _first_token_col(srccode, end, line_start)
+                if col >= 0:
+                    for ctx in stack:
+                        counts = ctx.col_counts
+                        counts[col] = counts.get(col, 0) + 1
 
     # Yield any unterminated contexts (syntax errors) to be defensive
     while stack:
@@ -97,50 +166,57 @@ def _desired_inner_col(ctx: Context) -> Optional[int]:
     """Choose the 'continuation indent column' representative for the context.
     We pick the **mode** (most common) of inner first-token columns, or min if tie.
     """
-    if not ctx.inner_line_first_cols:
-        return None
-    counts = Counter(ctx.inner_line_first_cols.values())
-    maxfreq = max(counts.values())
-    candidates = [col for col, n in counts.items() if n == maxfreq]
-    return min(candidates)
-
-def _is_closer_only_line(srccode_lines: List[str], ctx: Context) -> bool:
+    best_col = None
+    best_n = 0
+    for col, n in ctx.col_counts.items():
+        if n > best_n or (n == best_n and col < best_col):
+            best_col = col
+            best_n = n
+    return best_col
+
+def _is_closer_only_line(srccode: str, ctx: Context) -> bool:
     """Return True if the line with the closer has no non-whitespace tokens before the closer."""
-    if ctx.closer_line is None or ctx.closer_col is None:
+    if ctx.closer_pos is None or ctx.closer_col is None:
         return False
-    line = srccode_lines[ctx.closer_line - 1]
-    prefix = line[:ctx.closer_col]
+    prefix = srccode[ctx.closer_pos - ctx.closer_col:ctx.closer_pos]
     # If there's any non-space/tab char in prefix, then there's code before closer
-    return all(ch in " \t" for ch in prefix)
+    return not prefix.strip(" \t")
+
+# a colon after a closer (spaces/tabs allowed in between) marks a block header
+_COLON_AFTER_CLOSER_RE = re.compile(r"[ \t]*:")
 
 from typing import Iterable, Tuple
 
-def _check_FUR901(srccode: str) -> Iterable[Tuple[int, int, str]]:
-    """Yield (line, col, message) for FUR901 violations."""
-    srccode_bytes = srccode.encode("utf-8")
-    contexts = list(_iter_contexts(srccode_bytes))
-    lines = srccode.splitlines(keepends=False)
+# FUR901 only ever flags a closer that is the first thing on its line.
+_CLOSER_ONLY_LINE_RE = re.compile(r"^[ \t]*[)\]}]", re.MULTILINE)
+
+def _has_closer_only_line(srccode: str) -> bool:
+    """Cheap prefilter: without a line starting with a closer there is nothing to flag."""
+    return _CLOSER_ONLY_LINE_RE.search(srccode) is not None
 
-    def _colon_after_closer(line: str, closer_col: int) -> bool:
-        """True if the first non-space char after the closer is a colon."""
-        i = closer_col + 1  # look *after* the closer char
-        while i < len(line) and line[i] in " \t":
-            i += 1
-        return i < len(line) and line[i] == ":"
+Diagnostic = Tuple[int, int, str]
 
-    for ctx in contexts:
+def _check_FUR901(srccode: str) -> List[Diagnostic]:
+    """Return (line, col, message) for FUR901 violations."""
+    # Skip the scan when no violation is possible
+    out: List[Diagnostic] = []
+    if not _has_closer_only_line(srccode):
+        return out
+
+    # Check each context as the scanner closes it, so it can be freed right away
+    # instead of keeping every bracket of the file alive until the end.
+    for ctx in _scan_brackets(srccode):
         # Only care about multiline contexts with at least one inner line
-        if ctx.closer_line is None or not ctx.inner_line_first_cols:
+        if ctx.closer_line is None or not ctx.col_counts:
             continue
 
         # --- NEW: Skip block headers like `if (...):`, `def foo(...):`, etc.
         # If a colon follows the closer on the same line, it's a block header → not a FUR901 case.
-        line_text = lines[ctx.closer_line - 1]  # ctx lines are typically 1-based
-        if _colon_after_closer(line_text, ctx.closer_col):
+        if _COLON_AFTER_CLOSER_RE.match(srccode, ctx.closer_pos + 1):
             continue
 
         # We only flag when the ending is closer-only (no element before closer on that line)
-        closer_only = _is_closer_only_line(lines, ctx) and not ctx.element_and_closer_same_line
+        closer_only = _is_closer_only_line(srccode, ctx) and not ctx.element_and_closer_same_line
         if not closer_only:
             continue
 
@@ -150,12 +226,115 @@ def _check_FUR901(srccode: str) -> Iterable[Tuple[int, int, str]]:
 
         # If closer's column differs from the desired inner continuation column → violation
         if ctx.closer_col != desired_col:
-            msg = (f"{CODE_FUR901} closer-only line must align with continuation indent "
-                   f"(expected col {desired_col}, found col {ctx.closer_col})")
-            yield (ctx.closer_line, ctx.closer_col, msg)
+            out.append((ctx.closer_line, ctx.closer_col, _FUR901_MSG % (desired_col, ctx.closer_col)))
+    return out
+
+def _check_all(srccode: str) -> List[Diagnostic]:
+    return _check_FUR901(srccode)
+
+# --- Diagnostics cache --------------------------------------------------------
+# flake8 runs the plugin once per file, and the same unchanged files are linted
+# over and over (pre-commit, CI, editors).  Diagnostics only depend on the source
+# text, so they are cached by content hash: in-process, and on disk across runs.
+#
+# The on-disk cache lives in $FURLINTER_CACHE_DIR (default: $XDG_CACHE_HOME/furlinter
+# or ~/.cache/furlinter), under a directory named after the plugin version and a
+# digest of this module, so any change to the checks invalidates it.
+# Set FURLINTER_CACHE_DIR to an empty string to disable it.
+#
+# Each process prunes its own directory on its first write, removing entries
+# that haven't been used for _DISK_CACHE_MAX_AGE seconds (hits refresh an
+# entry's mtime).  Directories of other versions are left alone: they may
+# belong to another environment sharing the cache.
+
+_MEMORY_CACHE_SIZE = 1024
+_DISK_CACHE_MAX_AGE = 30 * 24 * 60 * 60
+# only names we create are ever deleted, in case the cache dir is shared
+_CACHE_ENTRY_NAME_RE = re.compile(r"[0-9a-f]{32}(?:\.json|\.\d+\.tmp)")
+_memory_cache: Dict[bytes, Tuple[Diagnostic, ...]] = {}
+
+@functools.lru_cache(maxsize=None)
+def _disk_cache_dir() -> Optional[Path]:
+    root = os.environ.get("FURLINTER_CACHE_DIR")
+    if root is None:
+        root = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "furlinter")
+    if not root:
+        return None
+    try:
+        module_digest = hashlib.blake2b(Path(__file__).read_bytes(), digest_size=8).hexdigest()
+    except OSError:
+        return None
+    return Path(root) / f"{FurLinter.version}-{module_digest}"
 
-def _check_all(srccode: str):
-    yield from _check_FUR901(srccode)
+def _read_disk_cache(digest: bytes) -> Optional[Tuple[Diagnostic, ...]]:
+    cache_dir = _disk_cache_dir()
+    if cache_dir is None:
+        return None
+    path = cache_dir / f"{digest.hex()}.json"
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        diagnostics = tuple((int(line), int(col), str(msg)) for line, col, msg in data)
+    except Exception:
+        # missing, unreadable or corrupt entries are simply recomputed
+        return None
+    try:
+        os.utime(path)  # mark as recently used for _prune_disk_cache()
+    except OSError:
+        pass
+    return diagnostics
+
+@functools.lru_cache(maxsize=None)
+def _prune_disk_cache(cache_dir: Path) -> None:
+    """Delete cache entries not used for _DISK_CACHE_MAX_AGE (once per process)."""
+    cutoff = time.time() - _DISK_CACHE_MAX_AGE
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if not _CACHE_ENTRY_NAME_RE.fullmatch(entry.name):
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                except OSError:
+                    pass
+    except OSError:
+        pass
+
+def _write_disk_cache(digest: bytes, diagnostics: Tuple[Diagnostic, ...]) -> None:
+    cache_dir = _disk_cache_dir()
+    if cache_dir is None:
+        return
+    path = cache_dir / f"{digest.hex()}.json"
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps(diagnostics), encoding="utf-8")
+        # atomic, so concurrent flake8 jobs never see half-written entries
+        os.replace(tmp_path, path)
+    except OSError:
+        return
+    _prune_disk_cache(cache_dir)
+
+def _cached_diagnostics(srccode: str) -> Tuple[Diagnostic, ...]:
+    """Return the diagnostics of `_check_all(srccode)`, cached by content hash."""
+    digest = hashlib.blake2b(srccode.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    diagnostics = _memory_cache.pop(digest, None)
+    if diagnostics is not None:
+        # re-insert, so the least recently used entry is the one evicted
+        _memory_cache[digest] = diagnostics
+        return diagnostics
+
+    diagnostics = _read_disk_cache(digest)
+    if diagnostics is None:
+        diagnostics = tuple(_check_all(srccode))
+        _write_disk_cache(digest, diagnostics)
+
+    if len(_memory_cache) >= _MEMORY_CACHE_SIZE:
+        # evict the least recently used entry (dicts keep insertion order)
+        del _memory_cache[next(iter(_memory_cache))]
+    _memory_cache[digest] = diagnostics
+    return diagnostics
 
 class FurLinter:
     """Flake8 plugin entry point."""
@@ -163,22 +342,120 @@ class FurLinter:
     version = "0.1.0"
 
     def __init__(self, tree, filename: str = None, lines: List[str] = None) -> None:
-        # flake8 passes in 'tree' (AST) which we don't use for token-level checks
+        # flake8 passes in 'tree' (AST) which we don't use for token-level checks.
+        # 'file_tokens' isn't requested either: flake8 tokenizes lazily, and
+        # asking for the tokens would force that for files that are otherwise
+        # clean or already in our diagnostics cache; the scanner is cheaper.
         self.filename = filename
-        self._lines = lines  # may be provided by flake8 for stdin
-        self._srccode: Optional[str] = None
+        self._lines = lines  # always provided by flake8, from disk or stdin
 
     def run(self) -> Iterable[Tuple[int, int, str, type]]:
-        # Load source code either from flake8-provided lines or from the file
         if self._lines is not None:
-            self._srccode = "".join(self._lines)
+            srccode = "".join(self._lines)
         else:
+            # only reached when instantiated outside flake8
             if self.filename in (None, "stdin", "-"):
                 return
             try:
-                self._srccode = Path(self.filename).read_text(encoding="utf-8")
-            except Exception:
+                srccode = _read_source(self.filename)
+            except (OSError, SyntaxError, UnicodeDecodeError):
                 return
 
-        for line, col, message in _check_all(self._srccode):
-            yield line, col, message, type(self)
+        cls = type(self)
+        for line, col, message in _cached_diagnostics(srccode):
+            yield line, col, message, cls
+
+def _read_source(path: str) -> str:
+    """Read a Python file, honouring PEP 263 coding cookies like flake8 does."""
+    with tokenize.open(path) as f:
+        return f.read()
+
+# --- Standalone command line --------------------------------------------------
+# flake8 sets up every plugin for each file it checks.  Checking a batch of files
+# in one process (optionally spread over worker processes) amortizes that, and
+# shares the diagnostics caches across all files of the run.
+
+def _walk_py_files(directory: str) -> Iterator[str]:
+    """Yield the *.py files under `directory`, skipping hidden directories."""
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for name in sorted(files):
+            if name.endswith(".py"):
+                yield os.path.join(root, name)
+
+def _iter_paths(args: Iterable[str]) -> Iterator[str]:
+    """Expand files, directories (recursively, *.py) and glob patterns.
+
+    Each file is yielded once, even if several arguments cover it.
+    """
+    seen = set()
+    for arg in args:
+        if os.path.exists(arg):
+            # an existing path is used as-is, even if it contains glob characters
+            matches = [arg]
+        else:
+            # expand patterns ourselves for shells (and Windows) that don't
+            matches = sorted(glob.glob(arg, recursive=True)) or [arg]
+        for match in matches:
+            for path in _walk_py_files(match) if os.path.isdir(match) else [match]:
+                key = os.path.normpath(path)
+                if key not in seen:
+                    seen.add(key)
+                    yield path
+
+def _check_file(path: str) -> Tuple[str, Tuple[Diagnostic, ...], Optional[str]]:
+    """Return (path, diagnostics, error) for one file."""
+    try:
+        srccode = _read_source(path)
+    except OSError as exc:
+        return path, (), exc.strerror or str(exc)
+    except (SyntaxError, UnicodeDecodeError) as exc:
+        # bad or unknown coding cookie
+        return path, (), str(exc)
+    return path, _cached_diagnostics(srccode), None
+
+def _jobs(value: str) -> int:
+    """argparse type for --jobs: a non-negative number of processes."""
+    try:
+        jobs = int(value)
+    except ValueError:
+        jobs = -1
+    if jobs < 0:
+        raise argparse.ArgumentTypeError(f"expected a number >= 0, got {value!r}")
+    return jobs
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Check the given paths and print violations in flake8's format.
+
+    Returns 1 if any violation (or unreadable file) was found, else 0.
+    """
+    parser = argparse.ArgumentParser(
+        prog="furlinter",
+        description="Check Python files for the FUR rules without going through flake8.",
+        )
+    parser.add_argument("paths", nargs="+", metavar="PATH",
+                        help="files, directories or glob patterns to check")
+    parser.add_argument("-j", "--jobs", type=_jobs, default=1,
+                        help="number of worker processes, 0 for one per CPU (default: 1)")
+    args = parser.parse_args(argv)
+
+    paths = list(_iter_paths(args.paths))
+    if args.jobs == 1 or len(paths) < 2:
+        results: Iterable[Tuple[str, Tuple[Diagnostic, ...], Optional[str]]] = map(_check_file, paths)
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs or None) as executor:
+            results = list(executor.map(_check_file, paths, chunksize=16))
+
+    status = 0
+    for path, diagnostics, error in results:
+        if error is not None:
+            print(f"{path}: {error}", file=sys.stderr)
+            status = 1
+        for line, col, message in diagnostics:
+            # flake8 reports 1-based columns
+            print(f"{path}:{line}:{col + 1}: {message}")
+            status = 1
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
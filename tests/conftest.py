@@ -26,3 +26,16 @@ def selected_codes(request):
 @pytest.fixture(scope="session")
 def ignored_codes(request):
     return _csv_list(request.config.getoption("--fignore"))
+
+@pytest.fixture(scope="session")
+def snippet_tmpdir(tmp_path_factory):
+    """One directory for all snippet files of the session, instead of one per snippet."""
+    return tmp_path_factory.mktemp("snippets")
+
+@pytest.fixture(scope="session", autouse=True)
+def furlinter_cache_dir(tmp_path_factory):
+    """Point furlinter's disk cache (also used by the flake8 runs) away from the user's ~/.cache."""
+    with pytest.MonkeyPatch.context() as mp:
+        path = tmp_path_factory.mktemp("furlinter_cache")
+        mp.setenv("FURLINTER_CACHE_DIR", str(path))
+        yield path
@@ -0,0 +1,130 @@
+# Tests for furlinter's in-process and on-disk diagnostics caches.
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+import furlinter
+
+BAD_SRC = "a = [\n    1,\n    2,\n]\n"
+
+
+@pytest.fixture
+def cache_root(tmp_path: Path, monkeypatch) -> Path:
+    """A fresh, empty cache: FURLINTER_CACHE_DIR in tmp_path, nothing in memory."""
+    root = tmp_path / "cache"
+    monkeypatch.setenv("FURLINTER_CACHE_DIR", str(root))
+    monkeypatch.setattr(furlinter, "_memory_cache", {})
+    for func in (furlinter._disk_cache_dir, furlinter._prune_disk_cache):
+        func.cache_clear()
+    yield root
+    for func in (furlinter._disk_cache_dir, furlinter._prune_disk_cache):
+        func.cache_clear()
+
+
+@pytest.fixture
+def check_calls(monkeypatch) -> list:
+    """Record the sources _check_all() is called with."""
+    calls = []
+    check_all = furlinter._check_all
+
+    def recording_check_all(srccode):
+        calls.append(srccode)
+        return check_all(srccode)
+
+    monkeypatch.setattr(furlinter, "_check_all", recording_check_all)
+    return calls
+
+
+def entry_files(cache_root: Path) -> list:
+    return sorted(cache_root.glob("*/*.json"))
+
+
+def test_memory_hit_skips_check(cache_root: Path, check_calls: list):
+    first = furlinter._cached_diagnostics(BAD_SRC)
+    assert furlinter._cached_diagnostics(BAD_SRC) == first
+    assert len(first) == 1
+    assert check_calls == [BAD_SRC]
+
+
+def test_disk_hit_skips_check(cache_root: Path, check_calls: list):
+    first = furlinter._cached_diagnostics(BAD_SRC)
+    assert len(entry_files(cache_root)) == 1
+    furlinter._memory_cache.clear()
+    assert furlinter._cached_diagnostics(BAD_SRC) == first
+    assert check_calls == [BAD_SRC]
+
+
+def test_memory_cache_evicts_least_recently_used(cache_root: Path, check_calls: list, monkeypatch):
+    monkeypatch.setenv("FURLINTER_CACHE_DIR", "")  # memory only
+    monkeypatch.setattr(furlinter, "_MEMORY_CACHE_SIZE", 2)
+    a, b, c = "a = 1\n", "b = 2\n", "c = 3\n"
+    for src in (a, b, a, c):  # the hit on a makes b the least recently used
+        furlinter._cached_diagnostics(src)
+    assert check_calls == [a, b, c]
+    furlinter._cached_diagnostics(a)
+    assert check_calls == [a, b, c]
+    furlinter._cached_diagnostics(b)
+    assert check_calls == [a, b, c, b]
+
+
+def test_corrupt_entry_is_recomputed(cache_root: Path, check_calls: list):
+    expected = furlinter._cached_diagnostics(BAD_SRC)
+    (entry,) = entry_files(cache_root)
+    entry.write_text("{not json", encoding="utf-8")
+    furlinter._memory_cache.clear()
+    assert furlinter._cached_diagnostics(BAD_SRC) == expected
+    assert check_calls == [BAD_SRC, BAD_SRC]
+    # and the entry was rewritten
+    furlinter._memory_cache.clear()
+    assert furlinter._cached_diagnostics(BAD_SRC) == expected
+    assert len(check_calls) == 2
+
+
+def test_empty_cache_dir_disables_disk_cache(cache_root: Path, check_calls: list, monkeypatch):
+    monkeypatch.setenv("FURLINTER_CACHE_DIR", "")
+    assert furlinter._disk_cache_dir() is None
+    furlinter._cached_diagnostics(BAD_SRC)
+    furlinter._memory_cache.clear()
+    furlinter._cached_diagnostics(BAD_SRC)
+    assert check_calls == [BAD_SRC, BAD_SRC]
+    assert not cache_root.exists()
+
+
+def test_pruning_only_deletes_old_cache_entries(cache_root: Path):
+    cache_dir = furlinter._disk_cache_dir()
+    cache_dir.mkdir(parents=True)
+    old = os.path.getmtime(cache_dir) - furlinter._DISK_CACHE_MAX_AGE - 60
+
+    old_entry = cache_dir / ("0" * 32 + ".json")
+    old_tmp = cache_dir / ("1" * 32 + ".123.tmp")
+    recent_entry = cache_dir / ("2" * 32 + ".json")
+    old_foreign = cache_dir / "notes.txt"
+    other_version = cache_root / "0.0.1-0123456789abcdef"
+    other_version.mkdir()
+    other_entry = other_version / ("3" * 32 + ".json")
+    for path in (old_entry, old_tmp, recent_entry, old_foreign, other_entry):
+        path.write_text("[]", encoding="utf-8")
+    for path in (old_entry, old_tmp, old_foreign, other_entry):
+        os.utime(path, (old, old))
+
+    furlinter._cached_diagnostics(BAD_SRC)  # first write of the process prunes
+
+    assert not old_entry.exists()
+    assert not old_tmp.exists()
+    assert recent_entry.exists()
+    assert old_foreign.exists()  # not a name the cache creates
+    assert other_entry.exists()  # other versions' directories are left alone
+    assert len(entry_files(cache_root)) == 3
+
+
+def test_hit_refreshes_entry_mtime(cache_root: Path):
+    furlinter._cached_diagnostics(BAD_SRC)
+    (entry,) = entry_files(cache_root)
+    os.utime(entry, (0, 0))
+    furlinter._memory_cache.clear()
+    furlinter._cached_diagnostics(BAD_SRC)
+    assert entry.stat().st_mtime > 0
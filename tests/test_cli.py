@@ -0,0 +1,69 @@
+# Tests for the standalone `furlinter PATH...` command (furlinter.main).
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+import furlinter
+
+BAD_SRC = "a = [\n    1,\n    2,\n]\n"
+GOOD_SRC = "a = [\n    1,\n    2,\n    ]\n"
+BAD_MSG = "FUR901 closer-only line must align with continuation indent (expected col 4, found col 0)"
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    (tmp_path / "bad.py").write_text(BAD_SRC, encoding="utf-8")
+    (tmp_path / "good.py").write_text(GOOD_SRC, encoding="utf-8")
+    return tmp_path
+
+
+def test_reports_in_flake8_format_with_1_based_columns(project: Path, capsys):
+    assert furlinter.main([str(project / "bad.py")]) == 1
+    assert capsys.readouterr().out == f"{project / 'bad.py'}:4:1: {BAD_MSG}\n"
+
+
+def test_clean_file_exits_0(project: Path, capsys):
+    assert furlinter.main([str(project / "good.py")]) == 0
+    assert capsys.readouterr().out == ""
+
+
+def test_missing_file(project: Path, capsys):
+    missing = project / "missing.py"
+    assert furlinter.main([str(missing)]) == 1
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert captured.err == f"{missing}: No such file or directory\n"
+
+
+def test_files_are_checked_once(project: Path, capsys):
+    assert furlinter.main([str(project), str(project / "*.py"), str(project / "bad.py")]) == 1
+    assert capsys.readouterr().out.count(BAD_MSG) == 1
+
+
+def test_existing_path_with_glob_characters_is_used_as_is(tmp_path: Path, capsys):
+    path = tmp_path / "[x].py"
+    path.write_text(BAD_SRC, encoding="utf-8")
+    # what "[x].py" would match as a pattern
+    (tmp_path / "x.py").write_text(GOOD_SRC, encoding="utf-8")
+    assert furlinter.main([str(path)]) == 1
+    assert capsys.readouterr().out == f"{path}:4:1: {BAD_MSG}\n"
+
+
+def test_jobs(project: Path, capsys):
+    for i in range(4):
+        (project / f"bad_{i}.py").write_text(BAD_SRC, encoding="utf-8")
+    assert furlinter.main(["-j", "1", str(project)]) == 1
+    serial = capsys.readouterr().out
+    assert furlinter.main(["-j", "2", str(project)]) == 1
+    assert capsys.readouterr().out == serial
+    assert serial.count(BAD_MSG) == 5
+
+
+def test_negative_jobs_is_a_usage_error(project: Path, capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        furlinter.main(["-j", "-1", str(project)])
+    assert excinfo.value.code == 2
+    assert "--jobs: expected a number >= 0, got '-1'" in capsys.readouterr().err
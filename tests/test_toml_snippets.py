@@ -1,7 +1,7 @@
 # pytest test that validates Python snippets embedded in TOML files using flake8.
 # It discovers all *.toml files recursively (from a configurable root), reads each table
 # that contains both `src` (multiline code string) and `expected_codes` (list of flake8 codes),
-# runs flake8 on the snippet, and asserts the codes match.
+# runs flake8 on the snippets (one flake8 run for all of them), and asserts the codes match.
 #
 # Usage:
 #   1) Ensure flake8 is installed (and any plugins you need).
@@ -17,12 +17,20 @@
 
 from __future__ import annotations
 
+import hashlib
+import importlib.util
 import os
+import re
 import sys
 import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from itertools import chain, count
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Tuple, Union
+
+import pytest
 
 try:
     import tomllib  # Python 3.11+
@@ -61,12 +69,14 @@ def filter_codes(codes: List[str], select: List[str] = None, ignore: List[str] =
 
 # --- Discovery ----------------------------------------------------------------
 
+def _toml_files_under(root: Union[str, Path]) -> List[Path]:
+    root = Path(root)  # normalize str/Path/os.PathLike into Path
+    return [p for p in root.rglob("*.toml") if p.is_file()]
+
 def iter_toml_files(search_roots: Iterable[Union[str, Path]]) -> List[Path]:
-    files: List[Path] = []
-    for root in search_roots:
-        root = Path(root)  # normalize str/Path/os.PathLike into Path
-        files.extend(p for p in root.rglob("*.toml") if p.is_file())
-    return files
+    # walk the roots concurrently; the result keeps the order of `search_roots`
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        return list(chain.from_iterable(executor.map(_toml_files_under, search_roots)))
 
 def load_tests_from_toml(path: Path) -> List[Tuple[str, str, List[str]]]:
     """
@@ -92,44 +102,168 @@ def load_tests_from_toml(path: Path) -> List[Tuple[str, str, List[str]]]:
             cases.append((case_id, src, exp))
     return cases
 
+# pytest cache key: resolved path -> [st_mtime_ns, st_size, cases]
+TOML_CASES_CACHE_KEY = "furlinter/toml_cases"
 
-# --- Flake8 runner ------------------------------------------------------------
-
-def flake8_codes_for_snippet(src: str) -> Tuple[List[str], str]:
+def load_all_tests(toml_files: List[Path], cache=None) -> List[Tuple[str, str, List[str]]]:
     """
-    Write `src` to a temp .py file and run flake8 on it.
-    Returns (sorted_unique_codes, full_stdout).
+    Returns the cases of all `toml_files`, in order, parsing the files concurrently.
+    With `cache` (pytest's `config.cache`), files whose mtime and size are unchanged
+    since the last run are not parsed again.
     """
-    extra_args = os.getenv("FLAKE8_ARGS", "").split()
+    cached = cache.get(TOML_CASES_CACHE_KEY, {}) if cache is not None else {}
+    entries: Dict[str, list] = {}
+
+    def load(path: Path) -> List[Tuple[str, str, List[str]]]:
+        # stat before reading, so a file changed in between is parsed again next time
+        st = path.stat()
+        key = str(path.resolve())
+        entry = cached.get(key)
+        if entry is None or entry[:2] != [st.st_mtime_ns, st.st_size]:
+            entry = [st.st_mtime_ns, st.st_size, load_tests_from_toml(path)]
+        entries[key] = entry
+        return [tuple(case) for case in entry[2]]
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        all_cases = list(chain.from_iterable(executor.map(load, toml_files)))
+    if cache is not None and entries != cached:
+        cache.set(TOML_CASES_CACHE_KEY, entries)
+    return all_cases
+
+
+# --- Flake8 runner ------------------------------------------------------------
+
+def flake8_args() -> List[str]:
+    """Extra flake8 CLI args from FLAKE8_ISOLATED / FLAKE8_ARGS."""
     isolated = ["--isolated"] if os.getenv("FLAKE8_ISOLATED", "") == "1" else []
+    return [*isolated, *os.getenv("FLAKE8_ARGS", "").split()]
+
+# path:line:col: CODE message
+# e.g. /tmp/tmpabc/snippet_0.py:1:1: E302 expected 2 blank lines, found 1
+_FLAKE8_LINE_RE = re.compile(r"^(?P<path>.+?):\d+:\d+:(?:\s+(?P<code>[A-Z]\w+)\b)?")
+
+# numbers the snippet files, so that calls sharing a directory never collide
+# (next() on a count is atomic in CPython, so this is thread-safe)
+_snippet_counter = count()
 
-    with tempfile.TemporaryDirectory() as td:
-        py_path = Path(td) / "snippet.py"
-        py_path.write_text(src, encoding="utf-8")
+def run_flake8(unique_srcs: List[str], args: List[str], tmpdir: Path = None) -> Dict[str, Tuple[List[str], str]]:
+    """
+    Write each snippet to its own .py file in `tmpdir` (a fresh temp dir if not given)
+    and run flake8 once on all of them.
+    Returns {src: (sorted_unique_codes, flake8_stdout_for_that_snippet)}.
+    """
+    with (nullcontext(str(tmpdir)) if tmpdir is not None else tempfile.TemporaryDirectory()) as td:
+        names: Dict[str, str] = {}  # file name -> src
+        py_paths = []
+        for src in unique_srcs:
+            py_path = Path(td) / f"snippet_{next(_snippet_counter)}.py"
+            py_path.write_text(src, encoding="utf-8")
+            names[py_path.name] = src
+            py_paths.append(str(py_path))
 
-        cmd = ["flake8", str(py_path), *isolated, *extra_args]
+        cmd = ["flake8", *py_paths, *args]
         try:
             proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=False)
         except FileNotFoundError:  # pragma: no cover
             raise RuntimeError("flake8 not found. Install with `pip install flake8` (and plugins if needed).")
+    # 0: no violations, 1: violations; anything else, or output on stderr, is
+    # flake8 itself failing (bad args, plugin crash), which must not read as
+    # "no codes" for every snippet -- nor be cached as such
+    if proc.returncode not in (0, 1) or proc.stderr.strip():
+        raise RuntimeError(
+            f"flake8 failed with exit status {proc.returncode}: {' '.join(cmd[:1] + list(args))}\n"
+            f"--- flake8 stderr ---\n{proc.stderr.strip() or '<no stderr>'}"
+            )
+
+    codes: Dict[str, List[str]] = {src: [] for src in unique_srcs}
+    outputs: Dict[str, List[str]] = {src: [] for src in unique_srcs}
+    for line in proc.stdout.strip().splitlines():
+        m = _FLAKE8_LINE_RE.match(line)
+        if m is None:
+            # Non-standard line? Ignore
+            continue
+        src = names.get(Path(m.group("path")).name)
+        if src is None:
+            continue
+        outputs[src].append(line)
+        # a line without a code is kept in the output for debugging only
+        if m.group("code"):
+            codes[src].append(m.group("code"))
+
+    return {src: (sorted(set(codes[src])), "\n".join(outputs[src])) for src in unique_srcs}
+
+# pytest cache key prefix for per-snippet flake8 results
+SNIPPET_CACHE_PREFIX = "furlinter/snippets/"
 
-        out = proc.stdout.strip()
-        codes = []
-        if out:
-            for line in out.splitlines():
-                # Expected format: path:line:col: CODE message
-                # Example: /tmp/tmpabc/snippet.py:1:1: E302 expected 2 blank lines, found 1
-                try:
-                    _path, _line, _col, rest = line.split(":", 3)
-                    code = rest.strip().split()[0]
-                    # Filter out non-code garbage just in case
-                    if code and code[0].isalpha():
-                        codes.append(code)
-                except ValueError:
-                    # Non-standard line? Ignore but keep output for debug
-                    pass
-        codes_sorted = sorted(set(codes))
-        return codes_sorted, out
+def flake8_cache_salt(args: List[str]) -> bytes:
+    """
+    Digest of everything besides the snippet that flake8's output depends on:
+    the `flake8 --version` string (flake8 and plugin versions), the furlinter
+    source, and the flake8 args.
+    """
+    try:
+        version = subprocess.run(["flake8", "--version"], stdout=subprocess.PIPE, text=True, check=False).stdout
+    except FileNotFoundError:  # pragma: no cover
+        raise RuntimeError("flake8 not found. Install with `pip install flake8` (and plugins if needed).")
+    spec = importlib.util.find_spec("furlinter")
+    furlinter_src = Path(spec.origin).read_bytes() if spec is not None and spec.origin else b""
+    h = hashlib.blake2b(digest_size=16)
+    for part in (version.encode("utf-8"), furlinter_src, "\0".join(args).encode("utf-8")):
+        h.update(hashlib.blake2b(part, digest_size=16).digest())
+    return h.digest()
+
+def flake8_codes_for_snippets(srcs: Iterable[str], cache=None, tmpdir: Path = None) -> Dict[str, Tuple[List[str], str]]:
+    """
+    Returns {src: (sorted_unique_codes, flake8_stdout_for_that_snippet)} for each distinct snippet.
+    With `cache` (pytest's `config.cache`), results of earlier runs are reused and only the
+    remaining snippets are passed to flake8. Snippet files go to `tmpdir`, if given.
+    """
+    unique_srcs = list(dict.fromkeys(srcs))
+    if not unique_srcs:
+        return {}
+    args = flake8_args()
+    if cache is None:
+        return run_flake8(unique_srcs, args, tmpdir)
+
+    salt = flake8_cache_salt(args)
+    keys = {
+        src: SNIPPET_CACHE_PREFIX + hashlib.blake2b(src.encode("utf-8"), digest_size=16, key=salt).hexdigest()
+        for src in unique_srcs
+        }
+    results: Dict[str, Tuple[List[str], str]] = {}
+    for src in unique_srcs:
+        hit = cache.get(keys[src], None)
+        if hit is not None:
+            codes, output = hit
+            results[src] = (codes, output)
+    missing = [src for src in unique_srcs if src not in results]
+    if missing:
+        # run_flake8() raises if flake8 itself failed, so only real results are cached
+        for src, (codes, output) in run_flake8(missing, args, tmpdir).items():
+            cache.set(keys[src], [codes, output])
+            results[src] = (codes, output)
+    return results
+
+def flake8_codes_for_snippet(src: str, tmpdir: Path = None) -> Tuple[List[str], str]:
+    """
+    Run flake8 on a single snippet.
+    Returns (sorted_unique_codes, full_stdout).
+    """
+    return flake8_codes_for_snippets([src], tmpdir=tmpdir)[src]
+
+@pytest.fixture(scope="session")
+def flake8_results(request, snippet_tmpdir: Path) -> Dict[str, Tuple[List[str], str]]:
+    """
+    flake8 results for the snippets of every collected test, from a single flake8 run
+    instead of one process per snippet (and cached across runs by pytest's cache).
+    """
+    srcs = [
+        item.callspec.params["src"]
+        for item in request.session.items
+        if "src" in getattr(getattr(item, "callspec", None), "params", {})
+        ]
+    # config.cache is None when the cacheprovider plugin is disabled
+    return flake8_codes_for_snippets(srcs, getattr(request.config, "cache", None), snippet_tmpdir)
 
 
 # --- Pytest generation --------------------------------------------------------
@@ -142,9 +276,8 @@ def pytest_generate_tests(metafunc):
         else:
             snippet_roots = metafunc.config.getini("testpaths")
         toml_files = iter_toml_files(snippet_roots)
-        all_cases: List[Tuple[str, str, List[str]]] = []
-        for tf in toml_files:
-            all_cases.extend(load_tests_from_toml(tf))
+        # config.cache is None when the cacheprovider plugin is disabled
+        all_cases = load_all_tests(toml_files, getattr(metafunc.config, "cache", None))
 
         if not all_cases:
             metafunc.parametrize(("case_id", "src", "expected_codes"), [], ids=[])
@@ -154,8 +287,12 @@ def pytest_generate_tests(metafunc):
         metafunc.parametrize(("case_id", "src", "expected_codes"), all_cases, ids=ids)
 
 
-def test_snippet(case_id: str, src: str, expected_codes: List[str], selected_codes: List[str], ignored_codes: List[str]):
-    got_codes, flake8_output = flake8_codes_for_snippet(src)
+def test_snippet(case_id: str, src: str, expected_codes: List[str], selected_codes: List[str], ignored_codes: List[str],
+                 flake8_results: Dict[str, Tuple[List[str], str]], snippet_tmpdir: Path):
+    if src in flake8_results:
+        got_codes, flake8_output = flake8_results[src]
+    else:  # not among the session's collected items (e.g. run from a custom hook)
+        got_codes, flake8_output = flake8_codes_for_snippet(src, snippet_tmpdir)
     exp_set = set(expected_codes)
     got_set = set(got_codes)
 